@@ -11,32 +11,49 @@ Usage:
 
 Requirements:
     - requests
-    - warcio
-    - beautifulsoup4
+    - aiohttp
+    - aiofiles
+    - fastwarc
+    - blake3
+    - selectolax
+    - pyahocorasick
+    - faust-cchardet
+    - orjson
     - tqdm
 """
 
 import os
 import sys
+import asyncio
 import gzip
-import json
+import codecs
+import orjson
 import argparse
 import random
-import hashlib
 from urllib.parse import urlparse
 import requests
+import aiohttp
+import aiofiles
 from tqdm import tqdm
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
-import io
-from warcio.archiveiterator import ArchiveIterator
-from concurrent.futures import ThreadPoolExecutor
+import ahocorasick
+import cchardet
+from blake3 import blake3
+from fastwarc.warc import ArchiveIterator, WarcRecordType
+from concurrent.futures import ProcessPoolExecutor
 
 # Constants
 DEFAULT_DOWNLOAD_SIZE = 100  # MB
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 INDEX_URL = "https://index.commoncrawl.org/"
 CC_BUCKET = "https://data.commoncrawl.org/"
+MAX_CONCURRENT_DOWNLOADS = 4
+# Browsers decode these labels as Windows-1252 (WHATWG Encoding Standard), so we do too
+WINDOWS_1252_ALIASES = ('iso8859-1', 'ascii')
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for JSONL output
+CRAWL_ID_PATTERN = re.compile(rb'CC-MAIN-\d{4}-\d{2}')
 
 # Potential bias keywords to look for
 BIAS_KEYWORDS = [
@@ -46,6 +63,16 @@ BIAS_KEYWORDS = [
     "bias", "unfair", "inequality", "privilege", "minority", "majority"
 ]
 
+# Automaton matching all bias keywords in a single pass over the text
+BIAS_AUTOMATON = ahocorasick.Automaton()
+for _keyword in BIAS_KEYWORDS:
+    BIAS_AUTOMATON.add_word(_keyword.lower(), _keyword)
+BIAS_AUTOMATON.make_automaton()
+
+# Texts are lowercased and scanned in chunks; the overlap catches keywords across chunk edges
+BIAS_SCAN_CHUNK = 4096
+BIAS_SCAN_OVERLAP = max(len(keyword) for keyword in BIAS_KEYWORDS) - 1
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Download a sample of CommonCrawl data")
@@ -55,6 +82,8 @@ def parse_args():
                         help=f"Output directory (default: {OUTPUT_DIR})")
     parser.add_argument("--filter-mode", choices=["bias", "all"], default="bias",
                         help="Whether to filter for bias-related content only")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Number of processes used to parse WARC files (default: CPU count)")
     return parser.parse_args()
 
 def ensure_dir(directory):
@@ -69,7 +98,7 @@ def get_latest_crawl_id():
         response = requests.get(INDEX_URL)
         response.raise_for_status()
         # Extract the latest crawl ID from the response
-        latest_id = re.search(r'CC-MAIN-\d{4}-\d{2}', response.text).group(0)
+        latest_id = CRAWL_ID_PATTERN.search(response.content).group(0).decode('ascii')
         return latest_id
     except Exception as e:
         print(f"Error getting latest crawl ID: {e}")
@@ -80,12 +109,13 @@ def get_warc_paths(crawl_id, num_files=2):
     """Get paths to WARC files from the specified crawl"""
     index_path = f"{CC_BUCKET}crawl-data/{crawl_id}/warc.paths.gz"
     try:
-        response = requests.get(index_path, stream=True)
-        response.raise_for_status()
-        
-        # Decompress and read the paths file
-        with gzip.GzipFile(fileobj=io.BytesIO(response.content)) as f:
-            paths = [line.decode('utf-8').strip() for line in f]
+        with requests.get(index_path, stream=True) as response:
+            response.raise_for_status()
+            
+            # Decompress the paths file while it streams in instead of buffering it first
+            response.raw.decode_content = True
+            with gzip.GzipFile(fileobj=response.raw) as f:
+                paths = [line.decode('utf-8').strip() for line in f]
         
         # Randomly select a subset of paths
         selected_paths = random.sample(paths, min(num_files, len(paths)))
@@ -98,57 +128,62 @@ def get_warc_paths(crawl_id, num_files=2):
             "crawl-data/CC-MAIN-2023-23/segments/1685224643388.28/warc/CC-MAIN-20230528083433-20230528113433-00001.warc.gz"
         ]
 
-def download_warc_file(warc_path, output_dir, max_size_mb=50):
+async def download_warc_file(session, semaphore, warc_path, output_dir, max_size_mb=50, position=0):
     """Download a portion of a WARC file"""
     url = f"{CC_BUCKET}{warc_path}"
     output_file = os.path.join(output_dir, os.path.basename(warc_path))
     
-    try:
-        # Stream the file and save a portion of it
-        print(f"Downloading from {url}...")
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        content_size = int(response.headers.get('content-length', 0))
-        max_bytes = max_size_mb * 1024 * 1024
-        bytes_to_read = min(content_size, max_bytes)
-        
-        progress_bar = tqdm(total=bytes_to_read, unit='B', unit_scale=True, desc=os.path.basename(warc_path))
-        
-        with open(output_file, 'wb') as f:
-            bytes_read = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                if bytes_read >= bytes_to_read:
-                    break
-                if chunk:
-                    bytes_remaining = bytes_to_read - bytes_read
-                    if len(chunk) > bytes_remaining:
-                        chunk = chunk[:bytes_remaining]
-                    f.write(chunk)
-                    bytes_read += len(chunk)
-                    progress_bar.update(len(chunk))
-        
-        progress_bar.close()
-        return output_file
-    except Exception as e:
-        print(f"Error downloading WARC file: {e}")
-        return None
+    async with semaphore:
+        try:
+            # Stream the file and save a portion of it
+            print(f"Downloading from {url}...")
+            # Only request the bytes we keep; the trimming below covers servers that ignore Range
+            max_bytes = max_size_mb * 1024 * 1024
+            headers = {'Range': f'bytes=0-{max_bytes - 1}'}
+            async with session.get(url, headers=headers) as response:
+                response.raise_for_status()
+                
+                content_size = int(response.headers.get('content-length', 0))
+                bytes_to_read = min(content_size, max_bytes)
+                
+                # Each download draws on its own line so concurrent bars don't overwrite each other
+                progress_bar = tqdm(total=bytes_to_read, unit='B', unit_scale=True, desc=os.path.basename(warc_path),
+                                    position=position)
+                
+                async with aiofiles.open(output_file, 'wb') as f:
+                    bytes_read = 0
+                    async for chunk in response.content.iter_chunked(65536):
+                        if bytes_read >= bytes_to_read:
+                            break
+                        if chunk:
+                            bytes_remaining = bytes_to_read - bytes_read
+                            if len(chunk) > bytes_remaining:
+                                chunk = chunk[:bytes_remaining]
+                            await f.write(chunk)
+                            bytes_read += len(chunk)
+                            progress_bar.update(len(chunk))
+                
+                progress_bar.close()
+            return output_file
+        except Exception as e:
+            print(f"Error downloading WARC file: {e}")
+            return None
 
 def extract_text_from_html(html_content):
     """Extract readable text from HTML content"""
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        tree = LexborHTMLParser(html_content)
+        if tree.root is None:
+            return ""
         
         # Remove script and style elements
-        for script in soup(["script", "style", "header", "footer", "nav"]):
-            script.extract()
+        tree.strip_tags(['script', 'style', 'header', 'footer', 'nav'])
         
         # Get text
-        text = soup.get_text(separator='\n')
+        text = tree.root.text(separator='\n')
         
         # Clean the text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        chunks = [phrase.strip() for line in text.split('\n') for phrase in line.strip().split("  ")]
         text = '\n'.join(chunk for chunk in chunks if chunk)
         
         return text
@@ -158,67 +193,121 @@ def extract_text_from_html(html_content):
 
 def contains_bias_keywords(text):
     """Check if text contains any bias-related keywords"""
-    text_lower = text.lower()
-    return any(keyword.lower() in text_lower for keyword in BIAS_KEYWORDS)
+    # Stop at the first chunk with a hit instead of lowercasing the whole document
+    for start in range(0, len(text), BIAS_SCAN_CHUNK):
+        chunk = text[max(0, start - BIAS_SCAN_OVERLAP):start + BIAS_SCAN_CHUNK].lower()
+        if next(BIAS_AUTOMATON.iter(chunk), None) is not None:
+            return True
+    return False
+
+def is_known_encoding(encoding):
+    """Check whether Python has a codec for the given encoding name"""
+    if not encoding:
+        return False
+    try:
+        codecs.lookup(encoding)
+        return True
+    except LookupError:
+        return False
+
+def detect_encoding(payload, charset=None):
+    """Determine the normalized encoding name of a payload from the HTTP charset, <meta charset> or cchardet"""
+    if not is_known_encoding(charset):
+        match = META_CHARSET_PATTERN.search(payload[:4096])
+        charset = match.group(1).decode('ascii') if match else None
+    if not is_known_encoding(charset):
+        charset = cchardet.detect(payload[:4096])['encoding']
+    
+    encoding = codecs.lookup(charset).name if is_known_encoding(charset) else 'cp1252'
+    return 'cp1252' if encoding in WINDOWS_1252_ALIASES else encoding
+
+def decode_payload(payload, charset=None):
+    """Return UTF-8 payloads as bytes for Lexbor to parse directly, and other payloads decoded to text"""
+    # Most pages are UTF-8 whatever their headers claim, so that is tried first
+    try:
+        payload.decode('utf-8')
+        return payload
+    except UnicodeDecodeError:
+        pass
+    
+    encoding = detect_encoding(payload, charset)
+    return payload.decode(encoding, errors='replace')
 
 def process_warc_file(warc_file, output_dir, filter_mode="bias", max_records=1000):
     """Process a WARC file and extract relevant content"""
-    output_file = os.path.join(output_dir, os.path.basename(warc_file).replace('.warc.gz', '.jsonl'))
+    base_name = re.sub(r'\.warc(\.gz|\.lz4)?$', '', os.path.basename(warc_file))
+    output_file = os.path.join(output_dir, base_name + '.jsonl')
     
     record_count = 0
     saved_count = 0
     
     try:
-        with open(output_file, 'w') as out:
-            with open(warc_file, 'rb') as stream:
-                for record in tqdm(ArchiveIterator(stream), desc="Processing records", total=max_records):
-                    if record_count >= max_records:
-                        break
-                    
-                    record_count += 1
-                    
-                    if record.rec_type == 'response' and record.http_headers and record.http_headers.get_header('Content-Type', '').startswith('text/html'):
-                        try:
-                            url = record.rec_headers.get_header('WARC-Target-URI')
-                            domain = urlparse(url).netloc
-                            payload = record.content_stream().read()
+        with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as out:
+            # FastWARC detects gzip/LZ4 compression itself and only returns response records
+            records = ArchiveIterator(warc_file, record_types=WarcRecordType.response)
+            for record in tqdm(records, desc="Processing records", total=max_records):
+                if record_count >= max_records:
+                    break
+                
+                record_count += 1
+                
+                if record.http_headers and record.http_headers.get('Content-Type', '').startswith('text/html'):
+                    try:
+                        url = record.headers.get('WARC-Target-URI')
+                        domain = urlparse(url).netloc
+                        payload = record.reader.read()
+                        
+                        if payload:
+                            # Lexbor parses bytes as UTF-8 itself, so only other encodings are decoded here
+                            text = extract_text_from_html(decode_payload(payload, record.http_charset))
                             
-                            if payload:
-                                content = None
-                                
-                                # Try to decode with different encodings
-                                for encoding in ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']:
-                                    try:
-                                        content = payload.decode(encoding)
-                                        break
-                                    except UnicodeDecodeError:
-                                        continue
-                                
-                                if content:
-                                    text = extract_text_from_html(content)
-                                    
-                                    # Skip if we're filtering for bias keywords and none are found
-                                    if filter_mode == "bias" and not contains_bias_keywords(text):
-                                        continue
-                                    
-                                    # Create a record and save it
-                                    document = {
-                                        'url': url,
-                                        'domain': domain,
-                                        'id': hashlib.md5(url.encode()).hexdigest(),
-                                        'text': text[:10000]  # Limit text size
-                                    }
-                                    
-                                    out.write(json.dumps(document) + '\n')
-                                    saved_count += 1
-                        except Exception as e:
-                            tqdm.write(f"Error processing record: {e}")
+                            # Skip if we're filtering for bias keywords and none are found
+                            if filter_mode == "bias" and not contains_bias_keywords(text):
+                                continue
+                            
+                            # Create a record and save it
+                            document = {
+                                'url': url,
+                                'domain': domain,
+                                'id': blake3(url.encode()).hexdigest()[:32],
+                                'text': text[:10000]  # Limit text size
+                            }
+                            
+                            out.write(orjson.dumps(document, option=orjson.OPT_APPEND_NEWLINE))
+                            saved_count += 1
+                    except Exception as e:
+                        tqdm.write(f"Error processing record: {e}")
     except Exception as e:
         print(f"Error processing WARC file: {e}")
     
     print(f"Processed {record_count} records, saved {saved_count} documents to {output_file}")
     return output_file
 
+async def download_and_process_warc_files(warc_paths, warc_dir, jsonl_dir, max_size_mb=50, filter_mode="bias",
+                                         max_concurrency=MAX_CONCURRENT_DOWNLOADS, max_workers=None):
+    """Download WARC files concurrently and process each one as soon as its download finishes"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+    
+    # WARC files are independent, so each one can be parsed on its own core
+    max_workers = min(max_workers or os.cpu_count() or 1, max(1, len(warc_paths)))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async def fetch_and_process(index, path):
+                warc_file = await download_warc_file(session, semaphore, path, warc_dir, max_size_mb, position=index)
+                if not warc_file:
+                    return None, None
+                # Parsing runs in a worker process so the remaining downloads keep streaming
+                jsonl_file = await loop.run_in_executor(pool, process_warc_file, warc_file, jsonl_dir, filter_mode)
+                return warc_file, jsonl_file
+            
+            results = await asyncio.gather(*[fetch_and_process(index, path) for index, path in enumerate(warc_paths)])
+    
+    warc_files = [warc_file for warc_file, _ in results if warc_file]
+    jsonl_files = [jsonl_file for _, jsonl_file in results if jsonl_file]
+    return warc_files, jsonl_files
+
 def main():
     args = parse_args()
     
@@ -240,19 +329,13 @@ def main():
     # Get WARC paths
     warc_paths = get_warc_paths(crawl_id, files_to_download)
     
-    # Download WARC files
-    warc_files = []
-    for path in warc_paths:
-        warc_file = download_warc_file(path, warc_dir, max_size_mb=min(50, args.size))
-        if warc_file:
-            warc_files.append(warc_file)
-    
-    # Process WARC files
-    jsonl_files = []
-    for warc_file in warc_files:
-        jsonl_file = process_warc_file(warc_file, jsonl_dir, filter_mode=args.filter_mode)
-        if jsonl_file:
-            jsonl_files.append(jsonl_file)
+    # Download and process WARC files, overlapping network I/O with parsing
+    warc_files, jsonl_files = asyncio.run(download_and_process_warc_files(
+        warc_paths, warc_dir, jsonl_dir,
+        max_size_mb=min(50, args.size),
+        filter_mode=args.filter_mode,
+        max_workers=args.workers
+    ))
     
     # Print summary
     total_size = sum(os.path.getsize(file) for file in warc_files + jsonl_files) / (1024 * 1024)
@@ -11,9 +11,70 @@ ethical reasoning process.
 import os
 import sys
 import json
+import time
 import random
 import argparse
-from datetime import datetime
+import uuid
+from collections import Counter
+
+import ahocorasick
+import orjson
+
+# Keywords used to detect the ethical category of user input
+ETHICAL_CATEGORIES = {
+    "privacy": ["privacy", "data", "surveillance", "tracking", "consent", "collection"],
+    "fairness": ["fairness", "bias", "discrimination", "equality", "equity", "justice"],
+    "autonomy": ["autonomy", "freedom", "choice", "control", "coercion", "manipulation"],
+    "harm": ["harm", "injury", "damage", "pain", "suffering", "safety", "risk"],
+    "deception": ["deception", "truth", "honesty", "transparency", "misleading", "lying"]
+}
+
+# Automaton mapping every keyword to its category, so input is scanned once
+CATEGORY_AUTOMATON = ahocorasick.Automaton()
+for _category, _keywords in ETHICAL_CATEGORIES.items():
+    for _keyword in _keywords:
+        CATEGORY_AUTOMATON.add_word(_keyword.lower(), (_category, _keyword))
+CATEGORY_AUTOMATON.make_automaton()
+
+# Ethical principles drawn on when reasoning about each category
+ETHICAL_PRINCIPLES = {
+    "privacy": (
+        "People have a right to control their personal information",
+        "Informed consent is necessary for ethical data collection",
+        "There should be transparency about how data is used",
+        "Data minimization limits collection to what is necessary"
+    ),
+    "fairness": (
+        "Resources and opportunities should be distributed equitably",
+        "Discrimination based on protected characteristics is unjust",
+        "Systems should be designed to reduce rather than amplify biases",
+        "Marginalized groups deserve special consideration"
+    ),
+    "autonomy": (
+        "Individuals should be free to make their own choices",
+        "Manipulation and coercion undermine autonomy",
+        "Meaningful choice requires adequate information and options",
+        "People should be treated as ends in themselves, not merely as means"
+    ),
+    "harm": (
+        "Actions should avoid causing unnecessary suffering",
+        "The benefits of an action should outweigh potential harms",
+        "Vulnerable populations deserve special protection",
+        "Both direct and indirect harms must be considered"
+    ),
+    "deception": (
+        "Honesty and truthfulness are foundational ethical values",
+        "Misleading others violates their trust and autonomy",
+        "Transparency promotes accountability",
+        "Withholding relevant information can be a form of deception"
+    ),
+    "general_ethics": (
+        "Respect for human dignity is fundamental",
+        "Actions should consider the welfare of all affected parties",
+        "Ethical decisions require balancing competing values",
+        "Context matters in ethical evaluation"
+    )
+}
 
 # Mock implementation of the Ollama_Agents API classes
 class AgentAPI:
@@ -36,9 +97,8 @@ class AgentAPI:
         if agent_type not in AgentAPI.list_agents():
             raise ValueError(f"Unknown agent type: {agent_type}")
         
-        # Create a session ID based on timestamp
-        import uuid
-        session_id = str(uuid.uuid4())
+        # Create a random session ID
+        session_id = uuid.uuid4().hex
         print(f"Created {agent_type} agent session: {session_id}")
         return session_id
     
@@ -48,24 +108,15 @@ class AgentAPI:
         # This is where we would normally connect to the Ollama API
         # For demonstration, we'll create a structured ethical analysis
         
-        # Simple keyword detection to determine ethical category
-        ethical_categories = {
-            "privacy": ["privacy", "data", "surveillance", "tracking", "consent", "collection"],
-            "fairness": ["fairness", "bias", "discrimination", "equality", "equity", "justice"],
-            "autonomy": ["autonomy", "freedom", "choice", "control", "coercion", "manipulation"],
-            "harm": ["harm", "injury", "damage", "pain", "suffering", "safety", "risk"],
-            "deception": ["deception", "truth", "honesty", "transparency", "misleading", "lying"]
-        }
+        # Simple keyword detection to determine ethical category:
+        # count the distinct keywords of each category found in a single pass
+        found_keywords = {match for _, match in CATEGORY_AUTOMATON.iter(user_input.lower())}
+        category_counts = Counter(category for category, _ in found_keywords)
         
-        # Determine the main ethical category
+        # Determine the main ethical category (ties go to the first category listed)
         detected_category = "general_ethics"
-        max_matches = 0
-        
-        for category, keywords in ethical_categories.items():
-            matches = sum(1 for keyword in keywords if keyword.lower() in user_input.lower())
-            if matches > max_matches:
-                max_matches = matches
-                detected_category = category
+        if category_counts:
+            detected_category = max(ETHICAL_CATEGORIES, key=lambda category: category_counts[category])
         
         # Generate the ethical reasoning response
         ethical_analysis = generate_ethical_reasoning(user_input, detected_category)
@@ -157,49 +208,8 @@ def generate_thought_section(passage, category):
     # For demonstration purposes, we'll create a structured analysis
     # In a real implementation, this would use the LLM through Ollama
     
-    ethical_principles = {
-        "privacy": [
-            "People have a right to control their personal information",
-            "Informed consent is necessary for ethical data collection",
-            "There should be transparency about how data is used",
-            "Data minimization limits collection to what is necessary"
-        ],
-        "fairness": [
-            "Resources and opportunities should be distributed equitably",
-            "Discrimination based on protected characteristics is unjust",
-            "Systems should be designed to reduce rather than amplify biases",
-            "Marginalized groups deserve special consideration"
-        ],
-        "autonomy": [
-            "Individuals should be free to make their own choices",
-            "Manipulation and coercion undermine autonomy",
-            "Meaningful choice requires adequate information and options",
-            "People should be treated as ends in themselves, not merely as means"
-        ],
-        "harm": [
-            "Actions should avoid causing unnecessary suffering",
-            "The benefits of an action should outweigh potential harms",
-            "Vulnerable populations deserve special protection",
-            "Both direct and indirect harms must be considered"
-        ],
-        "deception": [
-            "Honesty and truthfulness are foundational ethical values",
-            "Misleading others violates their trust and autonomy",
-            "Transparency promotes accountability",
-            "Withholding relevant information can be a form of deception"
-        ],
-        "general_ethics": [
-            "Respect for human dignity is fundamental",
-            "Actions should consider the welfare of all affected parties",
-            "Ethical decisions require balancing competing values",
-            "Context matters in ethical evaluation"
-        ]
-    }
-    
-    # Select relevant principles
-    selected_principles = ethical_principles.get(category, ethical_principles["general_ethics"])
-    random.shuffle(selected_principles)
-    principles = selected_principles[:3]  # Choose a subset
+    # Select a random subset of the relevant principles
+    principles = random.sample(ETHICAL_PRINCIPLES.get(category, ETHICAL_PRINCIPLES["general_ethics"]), 3)
     
     # Create the thought content
     thought_content = f"""I'll analyze this ethical situation concerning {category} in several steps:
@@ -274,20 +284,24 @@ def main():
             # Interactive mode
             print("\nEnter ethical scenarios to analyze. Type 'exit' to quit.")
             
-            while True:
-                user_input = input("\nScenario: ")
-                if user_input.lower() == 'exit':
-                    break
-                
-                response = AgentAPI.get_response(session_id, user_input)
-                print("\n" + response["reply"])
-                
-                # Save the response
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_file = args.output or f"ethical_analysis_{timestamp}.json"
-                with open(output_file, 'w') as f:
-                    json.dump(response, f, indent=2)
-                print(f"\nAnalysis saved to {output_file}")
+            # Append every response to a single JSONL file
+            output_file = args.output or "ethical_analyses.jsonl"
+            print(f"Analyses will be appended to {output_file}")
+            with open(output_file, 'ab', buffering=1 << 16) as out:
+                while True:
+                    user_input = input("\nScenario: ")
+                    if user_input.lower() == 'exit':
+                        break
+                    
+                    response = AgentAPI.get_response(session_id, user_input)
+                    print("\n" + response["reply"])
+                    
+                    # Save the response
+                    response["ts"] = time.time()
+                    out.write(orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE))
+                    # Flush each response so a killed session loses nothing; free at typing speed
+                    out.flush()
+            print(f"\nAnalyses appended to {output_file}")
                 
         elif args.scenario:
             # Process a single scenario
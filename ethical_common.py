@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Prompt templates and Ollama generation shared by the ethical data scripts
+"""
+
+import httpx
+from ollama import ResponseError
+
+MAX_PASSAGE_CHARS = 1500  # Longer passages are truncated before prompting
+
+# Static prompt templates, filled in with str.format for each passage
+SYSTEM_PROMPT_TEMPLATE = """You are an ethical reasoning assistant trained to analyze text passages and provide detailed ethical reasoning. 
+For the given text passage, identify ethical considerations related to {category} and develop a step-by-step ethical reasoning process.
+Analyze the implications thoroughly and consider multiple perspectives.
+
+Structure your reasoning into two main sections with the following format:
+<|begin_of_thought|>
+(Your step-by-step ethical analysis here, analyzing the ethical implications in detail)
+<|end_of_thought|>
+
+<|begin_of_solution|>
+(Your final ethical assessment and recommendation, summarizing the key points from your analysis)
+<|end_of_solution|>
+
+Keep your response concise but insightful, focusing on the most important ethical considerations."""
+
+USER_PROMPT_TEMPLATE = """Analyze the following text passage from an ethical perspective, focusing especially on considerations related to {category}:
+
+{passage}
+
+Provide ethical reasoning following the format I specified."""
+
+def build_prompts(passage, category):
+    """Return the system and user prompts for a passage"""
+    # Truncate passage if it's too long
+    if len(passage) > MAX_PASSAGE_CHARS:
+        passage = passage[:MAX_PASSAGE_CHARS] + "..."
+
+    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(category=category)
+    user_prompt = USER_PROMPT_TEMPLATE.format(category=category, passage=passage)
+    return system_prompt, user_prompt
+
+async def generate_ethical_reasoning(client, passage, category, model):
+    """Generate ethical reasoning for a passage using an ollama AsyncClient"""
+    system_prompt, user_prompt = build_prompts(passage, category)
+
+    try:
+        result = await client.generate(
+            model=model,
+            system=system_prompt,
+            prompt=user_prompt,
+            stream=False
+        )
+        return result.get("response", "")
+    except ResponseError as e:
+        return f"Error generating ethical reasoning: {e.status_code}"
+    except httpx.TimeoutException:
+        return "Request timed out while generating ethical reasoning"
+    except Exception as e:
+        return f"Exception during generation: {str(e)}"
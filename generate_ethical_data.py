@@ -7,23 +7,70 @@ detailed ethical reasoning.
 
 Usage:
     python generate_ethical_data.py [--input INPUT_DIR] [--output OUTPUT_FILE] [--count COUNT]
+
+Generations are sent to Ollama concurrently. Start the server with
+OLLAMA_NUM_PARALLEL set (e.g. OLLAMA_NUM_PARALLEL=8 ollama serve) and export the
+same value here (or pass --max-inflight) so the number of in-flight requests
+matches the server.
 """
 
 import os
-import json
+import asyncio
+import orjson
 import glob
+import hashlib
+import importlib.metadata
+import itertools
+import multiprocessing
+import pickle
+import tempfile
 import argparse
 import random
-import re
+from collections import Counter
 import requests
+import httpx
+import ahocorasick
+from datasketch import MinHash, MinHashLSH
+from ollama import AsyncClient
 from tqdm import tqdm
 
+from ethical_common import generate_ethical_reasoning
+
+def positive_int(value):
+    """Parse a strictly positive integer, for argparse and environment defaults"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
+def env_positive_int(name, default):
+    """Read a positive integer from the environment, falling back to default if unset or invalid"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return positive_int(value)
+    except argparse.ArgumentTypeError as e:
+        print(f"Warning: ignoring {name}: {e}; using {default}")
+        return default
+
 # Constants
 DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "jsonl")
 DEFAULT_OUTPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ethical_training.jsonl")
 DEFAULT_COUNT = 20
-OLLAMA_API = "http://localhost:11434/api/generate"
+OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_NUM_PARALLEL = env_positive_int("OLLAMA_NUM_PARALLEL", 4)
 DEFAULT_MODEL = "deepseek-r1"
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for the training JSONL
+FLUSH_EVERY = 16  # Flush the training JSONL after this many new examples
+CONTEXT_CHARS = 200  # Characters of context kept on each side of a keyword match
+MAX_PASSAGES_PER_DOC = 3
+AUTOMATON_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ollama_experiments")
+AUTOMATON_CACHE_FORMAT = 1  # Bump whenever build_keyword_automaton changes what it stores
+SCAN_BATCH_SIZE = 16384  # Documents held in memory at once while scanning
 
 # Ethical categories and keywords
 ETHICAL_CATEGORIES = {
@@ -49,13 +96,64 @@ ETHICAL_CATEGORIES = {
     ]
 }
 
-# Combined keywords for initial filtering
-ALL_ETHICAL_KEYWORDS = []
-for keywords in ETHICAL_CATEGORIES.values():
-    ALL_ETHICAL_KEYWORDS.extend(keywords)
+# Inverted index from each keyword to the categories that list it
+KW_TO_CAT = {}
+for category, keywords in ETHICAL_CATEGORIES.items():
+    for keyword in keywords:
+        KW_TO_CAT.setdefault(keyword, []).append(category)
+
+# Combined (deduplicated) keywords for initial filtering
+ALL_ETHICAL_KEYWORDS = list(KW_TO_CAT)
+
+def build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton that finds all keywords in one pass"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword.lower(), keyword)
+    automaton.make_automaton()
+    return automaton
+
+def ahocorasick_version():
+    """Return the installed pyahocorasick version, or 'unknown' if it has no metadata"""
+    try:
+        return importlib.metadata.version('pyahocorasick')
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+def load_keyword_automaton(keywords):
+    """Load the automaton for keywords from the on-disk cache, building and caching it on a miss"""
+    # Key on everything that shapes the pickle: the keywords, the value layout and the library build
+    cache_key = '\n'.join([f"format={AUTOMATON_CACHE_FORMAT}", f"pyahocorasick={ahocorasick_version()}", *sorted(keywords)])
+    digest = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+    cache_path = os.path.join(AUTOMATON_CACHE_DIR, f"{digest}.pkl")
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated or written by an incompatible pyahocorasick: rebuild it
+        pass
+    
+    automaton = build_keyword_automaton(keywords)
+    temp_path = None
+    try:
+        os.makedirs(AUTOMATON_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file and rename it so concurrent runs never see a partial pickle
+        with tempfile.NamedTemporaryFile(dir=AUTOMATON_CACHE_DIR, suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            pickle.dump(automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        # Caching is only an optimization: never fail the import, and leave no stray temp file
+        print(f"Note: Could not cache keyword automaton: {e}")
+        if temp_path:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    return automaton
 
-# Remove duplicates
-ALL_ETHICAL_KEYWORDS = list(set(ALL_ETHICAL_KEYWORDS))
+ETHICAL_AUTOMATON = load_keyword_automaton(ALL_ETHICAL_KEYWORDS)
 
 def parse_args():
     """Parse command line arguments"""
@@ -68,6 +166,10 @@ def parse_args():
                         help=f"Number of examples to generate (default: {DEFAULT_COUNT})")
     parser.add_argument("--model", type=str, default=DEFAULT_MODEL,
                         help=f"Ollama model to use (default: {DEFAULT_MODEL})")
+    parser.add_argument("--max-inflight", type=positive_int, default=OLLAMA_NUM_PARALLEL,
+                        help=f"Maximum number of concurrent Ollama requests (default: {OLLAMA_NUM_PARALLEL})")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count(),
+                        help="Number of processes used to scan documents (default: CPU count)")
     return parser.parse_args()
 
 def ensure_dir(file_path):
@@ -76,142 +178,189 @@ def ensure_dir(file_path):
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-def load_cc_data(input_dir):
-    """Load CommonCrawl data from JSONL files"""
-    all_data = []
+def iter_cc_data(input_dir):
+    """Stream CommonCrawl records from JSONL files one at a time"""
     jsonl_files = glob.glob(os.path.join(input_dir, "*.jsonl"))
     
     if not jsonl_files:
         print(f"No JSONL files found in {input_dir}")
-        return []
+        return
     
     for file_path in jsonl_files:
         print(f"Loading data from {file_path}...")
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             for line in f:
                 try:
-                    record = json.loads(line.strip())
-                    all_data.append(record)
-                except json.JSONDecodeError:
+                    # orjson parses the raw bytes directly and ignores surrounding whitespace
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
-    
-    print(f"Loaded {len(all_data)} documents from {len(jsonl_files)} files")
-    return all_data
 
-def extract_ethical_content(documents, keywords=ALL_ETHICAL_KEYWORDS, max_length=1000):
-    """Extract passages that contain ethical keywords"""
-    ethical_passages = []
+def is_word_char(char):
+    """Check whether a character is a word character in the regex sense (\\w)"""
+    return char.isalnum() or char == '_'
+
+def find_keyword_matches(lower_text, automaton=ETHICAL_AUTOMATON, start=0, end=None):
+    """Yield (start, end, keyword) for each whole-word keyword match in lowercased text[start:end]"""
+    for end_index, keyword in automaton.iter(lower_text, start, len(lower_text) if end is None else end):
+        match_start = end_index - len(keyword) + 1
+        match_end = end_index + 1
+        
+        # Only accept whole words, like r'\b' + keyword + r'\b'
+        if match_start > 0 and is_word_char(lower_text[match_start - 1]):
+            continue
+        if match_end < len(lower_text) and is_word_char(lower_text[match_end]):
+            continue
+        
+        yield match_start, match_end, keyword
+
+def scan_document(doc, automaton=ETHICAL_AUTOMATON, max_length=1000, count_in_window=False):
+    """Return the passages of a single document that contain ethical keywords"""
+    # count_in_window must be set when automaton matches keywords other than the category ones,
+    # since the category tallies are otherwise taken from the scan's own matches
+    passages = []
+    text = doc.get('text', '')
+    
+    # Skip very short texts
+    if len(text) < 100:
+        return passages
+    
+    # Lowercase once per document for matching
+    lower_text = text.lower()
     
-    for doc in tqdm(documents, desc="Scanning for ethical content"):
-        text = doc.get('text', '')
+    # Matches arrive in text order, so stop once enough non-overlapping passages are found
+    last_end = 0
+    count_end = 0
+    category_counts = None  # Tallies for the current passage, set when the first passage starts
+    skipped = []  # Matches past the current passage that may fall inside the next one
+    for match_start, match_end, keyword in find_keyword_matches(lower_text, automaton):
+        # Tally every match inside the current passage so categorizing needs no second scan
+        if match_end <= count_end:
+            if not count_in_window:
+                category_counts.update(KW_TO_CAT[keyword])
+            continue
+        if len(passages) >= MAX_PASSAGES_PER_DOC:
+            break
         
-        # Skip very short texts
-        if len(text) < 100:
+        # Get context around the match, skipping matches whose context overlaps the previous passage
+        start = max(0, match_start - CONTEXT_CHARS)
+        if passages and start < last_end:
+            skipped.append((match_start, match_end, keyword))
             continue
+        end = min(len(text), match_end + CONTEXT_CHARS)
+        last_end = end
+        count_end = min(end, start + max_length)
         
-        # Check for ethical keywords
-        matches = []
-        for keyword in keywords:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            for match in re.finditer(pattern, text.lower()):
-                # Get context around the match
-                start = max(0, match.start() - 200)
-                end = min(len(text), match.end() + 200)
-                matches.append((match.start(), text[start:end]))
+        passage = text[start:end]
+        if len(passage) > max_length:
+            passage = passage[:max_length] + "..."
         
-        # If matches found, add to ethical passages
-        if matches:
-            # Sort by position in text
-            matches.sort(key=lambda x: x[0])
-            
-            # Take up to 3 matches from this document
-            for _, passage in matches[:3]:
-                if len(passage) > max_length:
-                    passage = passage[:max_length] + "..."
-                ethical_passages.append({
-                    'passage': passage,
-                    'url': doc.get('url', ''),
-                    'domain': doc.get('domain', '')
-                })
+        # Seeding every category keeps ties resolved in ETHICAL_CATEGORIES order
+        category_counts = Counter(dict.fromkeys(ETHICAL_CATEGORIES, 0))
+        if not count_in_window:
+            skipped.append((match_start, match_end, keyword))
+            for skipped_start, skipped_end, skipped_keyword in skipped:
+                if skipped_start >= start and skipped_end <= count_end:
+                    category_counts.update(KW_TO_CAT[skipped_keyword])
+        else:
+            # Custom keywords say nothing about categories, so count the category keywords in the window
+            for _, _, category_keyword in find_keyword_matches(lower_text, ETHICAL_AUTOMATON, start, count_end):
+                category_counts.update(KW_TO_CAT[category_keyword])
+        skipped.clear()
+        passages.append({
+            'passage': passage,
+            'category_counts': category_counts,
+            'url': doc.get('url', ''),
+            'domain': doc.get('domain', '')
+        })
+    
+    return passages
+
+# Per-process state for extraction workers, set once by init_scan_worker
+_scan_automaton = None
+_scan_max_length = None
+_scan_count_in_window = False
+
+def init_scan_worker(automaton, max_length, count_in_window):
+    """Store the keyword automaton in a worker process so it is not sent with every task"""
+    global _scan_automaton, _scan_max_length, _scan_count_in_window
+    _scan_automaton = automaton
+    _scan_max_length = max_length
+    _scan_count_in_window = count_in_window
+
+def scan_document_in_worker(doc):
+    """Scan a document using the automaton installed by init_scan_worker"""
+    # None selects this process's own ETHICAL_AUTOMATON
+    automaton = ETHICAL_AUTOMATON if _scan_automaton is None else _scan_automaton
+    return scan_document(doc, automaton, _scan_max_length, _scan_count_in_window)
+
+def extract_ethical_content(documents, keywords=ALL_ETHICAL_KEYWORDS, max_length=1000, workers=None):
+    """Extract passages that contain ethical keywords, scanning documents in parallel"""
+    # Only keyword lists that differ from the category keywords need categories counted separately
+    custom_keywords = set(keywords) != set(ALL_ETHICAL_KEYWORDS)
+    
+    # Workers already have ETHICAL_AUTOMATON, so only a custom automaton is sent to them;
+    # custom automata are built in memory so one-off keyword lists don't pile up in the cache
+    automaton = build_keyword_automaton(keywords) if custom_keywords else None
+    ethical_passages = []
+    documents = iter(documents)
+    
+    with multiprocessing.Pool(processes=workers, initializer=init_scan_worker,
+                              initargs=(automaton, max_length, custom_keywords)) as pool:
+        progress = tqdm(desc="Scanning for ethical content", unit="doc")
+        # Pool.imap drains its input eagerly, so feed it bounded batches
+        # to keep only SCAN_BATCH_SIZE documents in memory at a time
+        for batch in iter(lambda: list(itertools.islice(documents, SCAN_BATCH_SIZE)), []):
+            # imap keeps passages in document order so dedup and sampling are reproducible
+            for passages in pool.imap(scan_document_in_worker, batch, chunksize=256):
+                ethical_passages.extend(passages)
+                progress.update()
+        progress.close()
     
     print(f"Found {len(ethical_passages)} passages with ethical content")
     return ethical_passages
 
+def deduplicate_passages(passages, threshold=0.8, num_perm=64, shingle_size=5):
+    """Drop near-duplicate passages using MinHash LSH over word shingles"""
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    unique_passages = []
+    
+    def shingle_batches():
+        for passage in passages:
+            words = passage['passage'].lower().split()
+            shingles = {' '.join(words[j:j + shingle_size]) for j in range(max(1, len(words) - shingle_size + 1))}
+            yield [shingle.encode('utf-8') for shingle in shingles]
+    
+    # MinHash.generator builds the permutation arrays once and copies them into every passage's MinHash
+    minhashes = MinHash.generator(shingle_batches(), num_perm=num_perm)
+    for i, (passage, minhash) in enumerate(zip(tqdm(passages, desc="Removing near-duplicates"), minhashes)):
+        # Skip passages that collide with one we already kept
+        if lsh.query(minhash):
+            continue
+        lsh.insert(i, minhash)
+        unique_passages.append(passage)
+    
+    print(f"Kept {len(unique_passages)} of {len(passages)} passages after removing near-duplicates")
+    return unique_passages
+
 def categorize_ethical_content(passages):
     """Determine primary ethical category for each passage"""
     categorized = []
     
     for passage in tqdm(passages, desc="Categorizing content"):
-        text = passage['passage'].lower()
-        
-        # Count matches for each category
-        category_counts = {}
-        for category, keywords in ETHICAL_CATEGORIES.items():
-            count = 0
-            for keyword in keywords:
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                count += len(re.findall(pattern, text))
-            category_counts[category] = count
+        # Category tallies were collected while scanning during extraction
+        category_counts = passage.pop('category_counts')
         
         # Choose primary category (highest count)
-        if sum(category_counts.values()) > 0:
-            primary_category = max(category_counts.items(), key=lambda x: x[1])[0]
+        primary_category, count = category_counts.most_common(1)[0]
+        if count > 0:
             passage['category'] = primary_category
             categorized.append(passage)
     
     return categorized
 
-def generate_ethical_reasoning(passage, category, model=DEFAULT_MODEL, timeout=60):
-    """Generate ethical reasoning for a passage using Ollama API"""
-    # Truncate passage if it's too long
-    if len(passage) > 1500:
-        passage = passage[:1500] + "..."
-    
-    system_prompt = f"""You are an ethical reasoning assistant trained to analyze text passages and provide detailed ethical reasoning. 
-For the given text passage, identify ethical considerations related to {category} and develop a step-by-step ethical reasoning process.
-Analyze the implications thoroughly and consider multiple perspectives.
-
-Structure your reasoning into two main sections with the following format:
-<|begin_of_thought|>
-(Your step-by-step ethical analysis here, analyzing the ethical implications in detail)
-<|end_of_thought|>
-
-<|begin_of_solution|>
-(Your final ethical assessment and recommendation, summarizing the key points from your analysis)
-<|end_of_solution|>
-
-Keep your response concise but insightful, focusing on the most important ethical considerations."""
-
-    user_prompt = f"""Analyze the following text passage from an ethical perspective, focusing especially on considerations related to {category}:
-
-{passage}
-
-Provide ethical reasoning following the format I specified."""
-
-    try:
-        response = requests.post(
-            OLLAMA_API,
-            json={
-                "model": model,
-                "system": system_prompt,
-                "prompt": user_prompt,
-                "stream": False
-            },
-            timeout=timeout
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "")
-        else:
-            return f"Error generating ethical reasoning: {response.status_code}"
-    except requests.exceptions.Timeout:
-        return "Request timed out while generating ethical reasoning"
-    except Exception as e:
-        return f"Exception during generation: {str(e)}"
-
-def generate_training_data(passages, count, model=DEFAULT_MODEL):
-    """Generate training examples with ethical reasoning"""
+def generate_training_data(passages, count, output_file, model=DEFAULT_MODEL, max_inflight=OLLAMA_NUM_PARALLEL):
+    """Generate training examples with ethical reasoning and write them to a JSONL file"""
     # Ensure we have enough passages
     if len(passages) < count:
         print(f"Warning: Only {len(passages)} passages available, less than requested {count}")
@@ -234,7 +383,9 @@ def generate_training_data(passages, count, model=DEFAULT_MODEL):
     
     # If we still need more passages, add randomly
     if len(selected_passages) < count:
-        remaining = [p for p in passages if p not in selected_passages]
+        # Compare by identity: membership tests against the selected list were O(N^2)
+        selected_ids = {id(p) for p in selected_passages}
+        remaining = [p for p in passages if id(p) not in selected_ids]
         if remaining:
             selected_passages.extend(random.sample(
                 remaining,
@@ -244,81 +395,96 @@ def generate_training_data(passages, count, model=DEFAULT_MODEL):
     # Limit to requested count
     selected_passages = selected_passages[:count]
     
-    # Generate ethical reasoning for each passage
-    training_data = []
-    
+    # Generate ethical reasoning for the passages concurrently
     print(f"Generating ethical reasoning for {len(selected_passages)} passages")
-    for i, passage in enumerate(selected_passages):
-        category = passage.get('category', 'general ethics')
-        
-        # Progress display
-        print(f"Processing example {i+1}/{len(selected_passages)}: {category}")
-        
-        # Generate reasoning with timeout protection
-        try:
-            reasoning = generate_ethical_reasoning(passage['passage'], category, model, timeout=90)
-            
-            # Create training example
-            example = {
-                "passage": passage['passage'],
-                "category": category,
-                "url": passage.get('url', ''),
-                "domain": passage.get('domain', ''),
-                "reasoning": reasoning
-            }
-            
-            training_data.append(example)
-            
-            # Save example immediately to avoid losing work if script crashes
-            with open(f"data/ethical_examples_{i+1}.json", 'w', encoding='utf-8') as f:
-                json.dump(example, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error processing example {i+1}: {str(e)}")
-            continue
+    ensure_dir(output_file)
+    training_data = asyncio.run(generate_examples(selected_passages, output_file, model, max_inflight))
     
+    print(f"Saved {len(training_data)} training examples to {output_file}")
     return training_data
 
-def save_training_data(training_data, output_file):
-    """Save training data to a JSONL file"""
-    ensure_dir(output_file)
+async def generate_examples(passages, output_file, model=DEFAULT_MODEL, max_inflight=OLLAMA_NUM_PARALLEL, timeout=90):
+    """Generate ethical reasoning for passages, writing each example to output_file as it completes"""
+    training_data = []
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for example in training_data:
-            f.write(json.dumps(example) + '\n')
+    # Pool one keep-alive connection per in-flight request so connections are reused, never exhausted
+    limits = httpx.Limits(max_connections=max_inflight, max_keepalive_connections=max_inflight, keepalive_expiry=30.0)
     
-    print(f"Saved {len(training_data)} training examples to {output_file}")
+    with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as out:
+        async with AsyncClient(host=OLLAMA_HOST, timeout=timeout, limits=limits) as client:
+            async def generate_example(i, passage):
+                category = passage.get('category', 'general ethics')
+                
+                # Progress display
+                print(f"Processing example {i+1}/{len(passages)}: {category}")
+                
+                try:
+                    reasoning = await generate_ethical_reasoning(client, passage['passage'], category, model)
+                    
+                    # Create training example
+                    return {
+                        "passage": passage['passage'],
+                        "category": category,
+                        "url": passage.get('url', ''),
+                        "domain": passage.get('domain', ''),
+                        "reasoning": reasoning
+                    }
+                except Exception as e:
+                    print(f"Error processing example {i+1}: {str(e)}")
+                    return None
+            
+            # Sliding window: whenever a request completes, start the next passage
+            queued = iter(enumerate(passages))
+            pending = set()
+            while True:
+                for i, passage in itertools.islice(queued, max_inflight - len(pending)):
+                    pending.add(asyncio.create_task(generate_example(i, passage)))
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    example = task.result()
+                    if not example:
+                        continue
+                    
+                    # Save examples as they arrive; flush periodically to limit work lost on a crash
+                    training_data.append(example)
+                    out.write(orjson.dumps(example, option=orjson.OPT_APPEND_NEWLINE))
+                    if len(training_data) % FLUSH_EVERY == 0:
+                        out.flush()
+    
+    return training_data
 
 def main():
     args = parse_args()
     
     # Check if Ollama API is available
     try:
-        response = requests.get("http://localhost:11434/api/tags")
+        response = requests.get(f"{OLLAMA_HOST}/api/tags")
         if response.status_code != 200:
             print("Warning: Ollama API doesn't seem to be available. Generation may fail.")
     except Exception:
         print("Warning: Ollama API doesn't seem to be available. Generation may fail.")
     
-    # Load data
-    documents = load_cc_data(args.input)
+    # Stream documents straight into the scanner instead of loading them all
+    documents = iter_cc_data(args.input)
     
-    if not documents:
-        print("No documents found. Please run the download script first.")
+    print("Extracting ethical content from documents...")
+    ethical_passages = extract_ethical_content(documents, workers=args.workers)
+    
+    if not ethical_passages:
+        print("No ethical content found. Please run the download script first.")
         return
     
-    # Process data
-    print(f"Extracting ethical content from {len(documents)} documents...")
-    ethical_passages = extract_ethical_content(documents)
+    # Avoid spending Ollama calls on near-identical passages
+    ethical_passages = deduplicate_passages(ethical_passages)
     
     print(f"Categorizing {len(ethical_passages)} ethical passages...")
     categorized_passages = categorize_ethical_content(ethical_passages)
     
     print(f"Generating {args.count} training examples...")
-    training_data = generate_training_data(categorized_passages, args.count, args.model)
-    
-    # Save training data
-    save_training_data(training_data, args.output)
+    generate_training_data(categorized_passages, args.count, args.output, args.model, args.max_inflight)
     
     print("Done!")
 
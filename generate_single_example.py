@@ -1,24 +1,28 @@
 #!/usr/bin/env python
 """
-Generate a single ethical reasoning example using pre-defined content
+Generate ethical reasoning examples for a small set of pre-defined scenarios.
+All scenarios are sent to Ollama concurrently and saved to one JSONL file.
 """
 
 import os
-import json
+import asyncio
 import argparse
-import requests
+import orjson
+from ollama import AsyncClient
+
+from ethical_common import generate_ethical_reasoning
 
 # Constants
-OLLAMA_API = "http://localhost:11434/api/generate"
+OLLAMA_HOST = "http://localhost:11434"
 DEFAULT_MODEL = "deepseek-r1"
 
 def parse_args():
     """Parse command line arguments"""
-    parser = argparse.ArgumentParser(description="Generate a single ethical reasoning example")
+    parser = argparse.ArgumentParser(description="Generate ethical reasoning examples for pre-defined scenarios")
     parser.add_argument("--model", type=str, default=DEFAULT_MODEL,
                       help=f"Ollama model to use (default: {DEFAULT_MODEL})")
-    parser.add_argument("--output", type=str, default="ethical_example.json",
-                      help="Output file path (default: ethical_example.json)")
+    parser.add_argument("--output", type=str, default="ethical_examples.jsonl",
+                      help="Output JSONL file path (default: ethical_examples.jsonl)")
     return parser.parse_args()
 
 def ensure_dir(file_path):
@@ -27,51 +31,24 @@ def ensure_dir(file_path):
     if directory and not os.path.exists(directory):
         os.makedirs(directory)
 
-def generate_ethical_reasoning(passage, category, model=DEFAULT_MODEL, timeout=60):
-    """Generate ethical reasoning for a passage using Ollama API"""
-    system_prompt = f"""You are an ethical reasoning assistant trained to analyze text passages and provide detailed ethical reasoning. 
-For the given text passage, identify ethical considerations related to {category} and develop a step-by-step ethical reasoning process.
-Analyze the implications thoroughly and consider multiple perspectives.
-
-Structure your reasoning into two main sections with the following format:
-<|begin_of_thought|>
-(Your step-by-step ethical analysis here, analyzing the ethical implications in detail)
-<|end_of_thought|>
-
-<|begin_of_solution|>
-(Your final ethical assessment and recommendation, summarizing the key points from your analysis)
-<|end_of_solution|>
-
-Keep your response concise but insightful, focusing on the most important ethical considerations."""
-
-    user_prompt = f"""Analyze the following text passage from an ethical perspective, focusing especially on considerations related to {category}:
-
-{passage}
-
-Provide ethical reasoning following the format I specified."""
-
-    try:
-        print(f"Sending request to Ollama API with model: {model}")
-        response = requests.post(
-            OLLAMA_API,
-            json={
-                "model": model,
-                "system": system_prompt,
-                "prompt": user_prompt,
-                "stream": False
-            },
-            timeout=timeout
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "")
-        else:
-            return f"Error generating ethical reasoning: {response.status_code}"
-    except requests.exceptions.Timeout:
-        return "Request timed out while generating ethical reasoning"
-    except Exception as e:
-        return f"Exception during generation: {str(e)}"
+async def generate_examples(scenarios, model=DEFAULT_MODEL, timeout=120):
+    """Generate reasoning for every scenario concurrently"""
+    print(f"Sending {len(scenarios)} requests to Ollama API with model: {model}")
+    
+    async with AsyncClient(host=OLLAMA_HOST, timeout=timeout) as client:
+        reasonings = await asyncio.gather(*[
+            generate_ethical_reasoning(client, scenario['passage'], scenario['category'], model)
+            for scenario in scenarios
+        ])
+    
+    return [
+        {
+            "passage": scenario['passage'],
+            "category": scenario['category'],
+            "reasoning": reasoning
+        }
+        for scenario, reasoning in zip(scenarios, reasonings)
+    ]
 
 def main():
     args = parse_args()
@@ -100,37 +77,24 @@ def main():
         }
     ]
     
-    # Use a specific scenario directly without user input
-    selected_scenario = scenarios[3]  # Autonomy
-    print(f"Using scenario ({selected_scenario['category']}):\n{selected_scenario['passage']}\n")
-    
-    # Generate reasoning with longer timeout
-    reasoning = generate_ethical_reasoning(
-        selected_scenario['passage'], 
-        selected_scenario['category'],
-        args.model,
-        timeout=120
-    )
+    examples = asyncio.run(generate_examples(scenarios, args.model))
     
-    # Print result
-    print("\n----- Generated Ethical Reasoning -----\n")
-    print(reasoning)
+    # Print results
+    for example in examples:
+        print(f"\n----- Generated Ethical Reasoning ({example['category']}) -----\n")
+        print(f"Scenario: {example['passage']}\n")
+        print(example['reasoning'])
     print("\n--------------------------------------\n")
     
     # Save to file
     output_file = args.output
     ensure_dir(output_file)
     
-    example = {
-        "passage": selected_scenario['passage'],
-        "category": selected_scenario['category'],
-        "reasoning": reasoning
-    }
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(example, f, indent=2)
+    with open(output_file, 'wb') as f:
+        for example in examples:
+            f.write(orjson.dumps(example, option=orjson.OPT_APPEND_NEWLINE))
     
-    print(f"Saved output to {output_file}")
+    print(f"Saved {len(examples)} examples to {output_file}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
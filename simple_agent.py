@@ -1,14 +1,21 @@
 import os
 import sys
+import uuid
+import httpx
+import orjson
+from pathlib import Path
 
 # Manual .env file loading
 def load_env_file():
     try:
-        with open('/Users/bard/Code/Ollama_Experiments/.env', 'r') as f:
-            for line in f:
-                if line.strip() and not line.startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    os.environ[key] = value
+        lines = Path(__file__).with_name('.env').read_text().splitlines()
+        env = dict(
+            (key.strip(), value.strip())
+            for key, value in (line.split('=', 1) for line in lines
+                               if '=' in line and not line.lstrip().startswith('#'))
+        )
+        # Variables already set in the environment take precedence over .env
+        os.environ.update({key: value for key, value in env.items() if key not in os.environ})
     except Exception as e:
         print(f"Note: Could not load .env file: {e}")
 
@@ -21,6 +28,12 @@ if "OLLAMA_HOST" not in os.environ:
 if "OLLAMA_MODEL" not in os.environ:
     os.environ["OLLAMA_MODEL"] = "deepseek-r1"
 
+# Shared HTTP client so consecutive requests reuse pooled keep-alive connections
+HTTP_CLIENT = httpx.Client(
+    timeout=httpx.Timeout(300.0, connect=10.0),
+    limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0)
+)
+
 # Simulated AgentAPI for demonstration
 class AgentAPI:
     """Simplified AgentAPI implementation for demonstration"""
@@ -43,17 +56,14 @@ class AgentAPI:
         
         # In a real implementation, we would connect to Ollama here
         # For demo purposes, we just return a simple session ID
-        import uuid
-        return str(uuid.uuid4())
+        return uuid.uuid4().hex
     
     @staticmethod
     def get_response(session_id, user_input):
         """Process user input and return agent response"""
-        import requests
-        
         # Connect to Ollama API
         try:
-            response = requests.post(
+            response = HTTP_CLIENT.post(
                 f"{os.environ['OLLAMA_HOST']}/api/generate",
                 json={
                     "model": os.environ["OLLAMA_MODEL"],
@@ -62,7 +72,7 @@ class AgentAPI:
                 }
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             return {
                 "reply": result.get("response", "Sorry, I couldn't generate a response."),
                 "session_id": session_id